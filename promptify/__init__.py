@@ -1,7 +1,7 @@
 __version__ = "2.0.3"
 from .parser.parser import Parser
 from .prompter.nlp_prompter import Prompter
-from .prompter.prompt_cache import PromptCache
+from .prompter.prompt_cache import PromptCache, SemanticPromptCache
 from .prompter.template_loader import TemplateLoader
 from .prompter.conversation_logger import ConversationLogger
 from .models.text2text.api.openai_models import OpenAI
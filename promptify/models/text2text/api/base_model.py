@@ -1,5 +1,7 @@
+import asyncio
+import functools
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional, Union, Dict
+from typing import Any, List, Optional, Union, Dict
 import tenacity
 
 
@@ -363,6 +365,31 @@ class Model(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def model_outputs(self, responses: List[Any], **kwargs) -> List[Any]:
+        """
+        Get the model outputs for a batch of responses.
+
+        Parameters
+        ----------
+        responses : List[Any]
+            The responses from the API calls.
+        **kwargs : dict
+            Keyword arguments to pass to `model_output`.
+
+        Returns
+        -------
+        List[Any]
+            The model output for each response, in the same order.
+
+        Notes
+        -----
+        The default implementation calls `model_output` once per response. Models whose responses
+        share one structure (for example token arrays from a local model) can override it to
+        post-process the whole batch at once.
+        """
+
+        return [self.model_output(response, **kwargs) for response in responses]
+
     def _retry_decorator(self):
         """
         Decorator function for retrying API requests if they fail.
@@ -408,3 +435,63 @@ class Model(metaclass=ABCMeta):
 
         decorated_run = self._retry_decorator()(self.run)
         return decorated_run(*args, **kwargs)
+
+    def execute_many_with_retry(self, prompts: List[str]) -> List[Any]:
+        """
+
+        Run the model on several prompts with the retry logic.
+
+        Parameters
+        ----------
+        prompts : List[str]
+            The prompts to run on the LLM.
+
+        Returns
+        -------
+        List[Any]
+            The output of the `run` method for each prompt, in the same order. A prompt that failed
+            after all retries gets the raised exception in its place, so one failure does not discard
+            the other responses.
+
+        Notes
+        -----
+        The default implementation calls `execute_with_retry` once per prompt. Endpoints that
+        accept several prompts in one request can override it to send a single batched call.
+        """
+
+        responses = []
+        for prompt in prompts:
+            try:
+                responses.append(self.execute_with_retry(prompt=prompt))
+            except Exception as e:
+                responses.append(e)
+        return responses
+
+    async def aexecute_with_retry(self, *args, **kwargs):
+        """
+
+        Asynchronous version of `execute_with_retry`.
+
+        Parameters
+        ----------
+        *args : tuple
+            A tuple of arguments to pass to the `run` method.
+        **kwargs : dict
+            A dictionary of keyword arguments to pass to the `run` method.
+
+        Returns
+        -------
+        Any
+            The output of the `run` method.
+
+        Notes
+        -----
+        The default implementation runs the blocking `execute_with_retry` in the event loop's default
+        executor, so several requests can be in flight at once. Endpoints with a native async client
+        can override it.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.execute_with_retry, *args, **kwargs)
+        )
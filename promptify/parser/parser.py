@@ -1,10 +1,26 @@
 import itertools
 from operator import itemgetter
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, Iterator, List, Union, Optional
 import re
 import ast
 
 
+def _iter_combinations(
+    candidate_marks: List[str], n: int, should_end_mark: Optional[str]
+) -> Iterator[str]:
+    if should_end_mark is None:
+        for i in range(1, n):
+            for comb in itertools.product(candidate_marks, repeat=i):
+                yield "".join(comb)
+        return
+    if should_end_mark not in candidate_marks:
+        return
+    # only build prefixes, every combination ends with should_end_mark
+    for i in range(1, n):
+        for comb in itertools.product(candidate_marks, repeat=i - 1):
+            yield "".join(comb) + should_end_mark
+
+
 class Parser:
     """
     A class to parse incomplete JSON objects and provide possible completions.
@@ -103,14 +119,7 @@ class Parser:
         list of str
             A list of all possible combinations of candidate marks up to length n.
         """
-        combinations = []
-        for i in range(1, n):
-            for comb in itertools.product(candidate_marks, repeat=i):
-                if should_end_mark is not None and comb[-1] != should_end_mark:
-                    # cut down search space
-                    continue
-                combinations.append("".join(comb))
-        return combinations
+        return list(_iter_combinations(candidate_marks, n, should_end_mark))
 
     def complete_json_object(self, json_str: str, completion_str: str) -> Any:
         """
@@ -189,8 +198,8 @@ class Parser:
         # specify the mark should end with
         should_end_mark = "]" if json_str.strip()[0] == "[" else "}"
         completions = []
-        for completion_str in self.get_combinations(
-            candidate_marks, json_depth_limit, should_end_mark=should_end_mark
+        for completion_str in _iter_combinations(
+            candidate_marks, json_depth_limit, should_end_mark
         ):
             try:
                 completed_obj = self.complete_json_object(json_str, completion_str)
@@ -1,9 +1,16 @@
-from pathlib import Path
+import asyncio
+import weakref
 from tqdm import tqdm
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from promptify.prompter.conversation_logger import *
 from promptify.utils.data_utils import *
-from promptify.prompter.prompt_cache import PromptCache
+from promptify.prompter.prompt_cache import PromptCache, SemanticPromptCache
+
+# resolved once per process, used when no output_path is given
+_CWD = os.getcwd()
+
+# run() signature introspection per model class
+_MODEL_META_CACHE = weakref.WeakKeyDictionary()
 
 
 class Pipeline:
@@ -17,41 +24,189 @@ class Pipeline:
         self.cache_prompt = kwargs.get("cache_prompt", True)
         self.cache_size = kwargs.get("cache_size", 200)
         self.prompt_cache = PromptCache(self.cache_size)
-        self.conversation_path = kwargs.get("output_path", Path.cwd())
+        self.render_cache = PromptCache(self.cache_size)
+        self.cache_kind = kwargs.get("cache_kind", "exact")
+        if self.cache_kind == "semantic":
+            self.semantic_cache = SemanticPromptCache(
+                self.cache_size, kwargs.get("semantic_threshold", 0.87)
+            )
+        elif self.cache_kind == "exact":
+            self.semantic_cache = None
+        else:
+            raise ValueError(
+                f"Unknown cache_kind {self.cache_kind}, expected 'exact' or 'semantic'"
+            )
+        self.conversation_path = kwargs.get("output_path") or _CWD
         self.structured_output = structured_output
 
-        self.model_args_count = self.model.run.__code__.co_argcount
-        self.model_variables = self.model.run.__code__.co_varnames[
-            1 : self.model_args_count
-        ]
+        self.model_args_count, self.model_variables = self._model_meta(model)
 
-        self.conversation_path = os.getcwd()
         self.model_dict = {
             key: value
             for key, value in model.__dict__.items()
-            if is_string_or_digit(value)
+            if isinstance(value, STRING_OR_DIGIT_TYPES)
         }
         self.logger = ConversationLogger(self.conversation_path, self.model_dict)
 
-    def fit(self, text_input: str, **kwargs) -> Any:
+    @staticmethod
+    def _model_meta(model):
+        model_class = type(model)
+        model_meta = _MODEL_META_CACHE.get(model_class)
+        if model_meta is None:
+            run_code = model.run.__code__
+            model_meta = (
+                run_code.co_argcount,
+                run_code.co_varnames[1 : run_code.co_argcount],
+            )
+            _MODEL_META_CACHE[model_class] = model_meta
+        return model_meta
+
+    def fit(self, text_input: str, *, verbose: bool = False, **kwargs) -> Any:
         """
         Processes an input text through the pipeline: generates a prompt, gets a response from the model,
         caches the response, logs the conversation, and returns the output.
         """
 
-        outputs_list = []
-        for prompter in tqdm(self.prompters):
+        return self.fit_many([text_input], verbose=verbose, **kwargs)[0]
+
+    def fit_many(
+        self, text_inputs: List[str], *, verbose: bool = False, **kwargs
+    ) -> List[Any]:
+        """
+        Processes several input texts through the pipeline. All prompts are generated first, the cache is
+        queried for each distinct prompt, and the remaining misses are sent to the model in one batch.
+        Returns one entry per input text, in the same order as `fit` would.
+        """
+
+        generated = [
+            self._generate_prompts(text_input, verbose, **kwargs)
+            for text_input in tqdm(text_inputs)
+        ]
+        outputs = self._get_outputs_from_cache_or_model(self._templates(generated))
+
+        return self._collect_outputs(generated, outputs)
+
+    async def afit(
+        self,
+        text_input: str,
+        *,
+        concurrency: int = 8,
+        verbose: bool = False,
+        **kwargs,
+    ) -> Any:
+        """
+        Asynchronous version of `fit`.
+        """
+
+        results = await self.afit_many(
+            [text_input], concurrency=concurrency, verbose=verbose, **kwargs
+        )
+        return results[0]
+
+    async def afit_many(
+        self,
+        text_inputs: List[str],
+        *,
+        concurrency: int = 8,
+        verbose: bool = False,
+        **kwargs,
+    ) -> List[Any]:
+        """
+        Asynchronous version of `fit_many`. Cache misses are sent to the model concurrently,
+        with at most `concurrency` requests in flight at a time.
+        """
+
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        generated = [
+            self._generate_prompts(text_input, verbose, **kwargs)
+            for text_input in text_inputs
+        ]
+        outputs = await self._aget_outputs_from_cache_or_model(
+            self._templates(generated), concurrency
+        )
+
+        return self._collect_outputs(generated, outputs)
+
+    @staticmethod
+    def _templates(generated) -> Dict[str, Any]:
+        # distinct prompts, in order, mapped to their semantic cache key
+        return {
+            template: semantic_key
+            for prompts in generated
+            if prompts is not None
+            for _, template, _, semantic_key in prompts
+        }
+
+    def _generate_prompts(self, text_input: str, verbose: bool, **kwargs):
+        prompts = []
+        for prompter in self.prompters:
             try:
-                template, variables_dict = prompter.generate(text_input, self.model.model, **kwargs)
+                template, variables_dict = self._generate_prompt(prompter, text_input, **kwargs)
 
             except ValueError as e:
                 print(f"Error in generating prompt: {e}")
                 return None
 
-            if kwargs.get("verbose", False):
+            if verbose:
                 print(template)
 
-            output = self._get_output_from_cache_or_model(template)
+            prompts.append(
+                (
+                    prompter,
+                    template,
+                    variables_dict,
+                    self._semantic_key(prompter, text_input, **kwargs),
+                )
+            )
+
+        return prompts
+
+    def _generate_prompt(self, prompter, text_input: str, **kwargs):
+        if not self.cache_prompt:
+            return prompter.generate(text_input, self.model.model, **kwargs)
+
+        key = prompter.cache_key(text_input, self.model.model, **kwargs)
+        if key is None:
+            return prompter.generate(text_input, self.model.model, **kwargs)
+
+        generated = self.render_cache.get(key)
+        if generated is None:
+            generated = prompter.generate(text_input, self.model.model, **kwargs)
+            self.render_cache.add(key, generated)
+
+        return generated
+
+    def _semantic_key(self, prompter, text_input: str, **kwargs):
+        # The semantic tier compares only the input text, scoped to the template and its other
+        # variables, so the fixed template text cannot make different inputs look alike.
+        if self.semantic_cache is None:
+            return None
+
+        scope = prompter.cache_key("", self.model.model, **kwargs)
+        if scope is None:
+            return None
+        return scope, text_input
+
+    def _collect_outputs(self, generated, outputs: Dict[str, Any]) -> List[Any]:
+        messages = []
+        results = [
+            self._collect_prompt_outputs(prompts, outputs, messages)
+            for prompts in generated
+        ]
+        if messages:
+            self.logger.add_messages(messages)
+
+        return results
+
+    def _collect_prompt_outputs(self, prompts, outputs: Dict[str, Any], messages: List):
+        if prompts is None:
+            return None
+
+        outputs_list = []
+        for prompter, template, variables_dict, _ in prompts:
+            output = outputs.get(template)
             if output is None:
                 return None
 
@@ -73,32 +228,105 @@ class Pipeline:
                     template, variables_dict, output, None, prompt_name
                 )
 
-            self.logger.add_message(message)
+            messages.append(message)
             outputs_list.append(output)
 
         return outputs_list
 
-    def _get_output_from_cache_or_model(self, template):
-        output = None
+    def _get_outputs_from_cache_or_model(
+        self, templates: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        outputs = self._get_outputs_from_cache(templates)
 
-        if self.cache_prompt:
-            output = self.prompt_cache.get(template)
+        missed_templates = [
+            template for template, output in outputs.items() if output is None
+        ]
+        if not missed_templates:
+            return outputs
 
-        if output is None:
-            try:
-                response = self.model.execute_with_retry(prompt=template)
-            except Exception as e:
-                print(f"Error in model execution: {e}")
-                return None
+        try:
+            responses = self.model.execute_many_with_retry(missed_templates)
+        except Exception as e:
+            print(f"Error in model execution: {e}")
+            return outputs
 
-            if self.structured_output:
-                output = self.model.model_output(
-                    response, json_depth_limit=self.json_depth_limit
-                )
+        self._process_responses(missed_templates, responses, outputs, templates)
+
+        return outputs
+
+    async def _aget_outputs_from_cache_or_model(
+        self, templates: Dict[str, Any], concurrency: int
+    ) -> Dict[str, Any]:
+        outputs = self._get_outputs_from_cache(templates)
+
+        missed_templates = [
+            template for template, output in outputs.items() if output is None
+        ]
+        if not missed_templates:
+            return outputs
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def execute(template):
+            async with semaphore:
+                return await self.model.aexecute_with_retry(prompt=template)
+
+        responses = await asyncio.gather(
+            *(execute(template) for template in missed_templates),
+            return_exceptions=True,
+        )
+
+        self._process_responses(missed_templates, responses, outputs, templates)
+
+        return outputs
+
+    def _get_outputs_from_cache(self, templates: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            template: (
+                self._get_output_from_cache(template, semantic_key)
+                if self.cache_prompt
+                else None
+            )
+            for template, semantic_key in templates.items()
+        }
+
+    def _get_output_from_cache(self, template: str, semantic_key) -> Any:
+        output = self.prompt_cache.get(template)
+
+        if output is None and semantic_key is not None:
+            scope, text_input = semantic_key
+            output = self.semantic_cache.get(text_input, scope=scope)
+            if output is not None:
+                self.prompt_cache.add(template, output)
+
+        return output
+
+    def _process_responses(
+        self,
+        missed_templates: List[str],
+        responses: List[Any],
+        outputs: Dict[str, Any],
+        templates: Dict[str, Any],
+    ) -> None:
+        answered = []
+        for template, response in zip(missed_templates, responses):
+            if isinstance(response, Exception):
+                print(f"Error in model execution: {response}")
             else:
-                output = response
+                answered.append((template, response))
 
+        responses = [response for _, response in answered]
+        if self.structured_output:
+            responses = self.model.model_outputs(
+                responses, json_depth_limit=self.json_depth_limit
+            )
+
+        for (template, _), output in zip(answered, responses):
             if self.cache_prompt:
                 self.prompt_cache.add(template, output)
+                semantic_key = templates[template]
+                if semantic_key is not None:
+                    scope, text_input = semantic_key
+                    self.semantic_cache.add(text_input, output, scope=scope)
 
-        return output
+            outputs[template] = output
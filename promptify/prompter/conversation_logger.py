@@ -1,7 +1,71 @@
+import atexit
+import os
+import queue
+import threading
+from typing import Any, Dict, List
 from promptify.utils.file_utils import *
 from promptify.utils.conversation_utils import *
 from promptify.utils.data_utils import *
 
+# Messages are written by a single background thread shared by all loggers,
+# so disk writes stay off the request path.
+_LOG_QUEUE = queue.Queue(maxsize=10_000)
+_LOG_BATCH_SIZE = 64
+_log_worker = None
+_log_worker_lock = threading.Lock()
+
+
+def _start_log_worker():
+    global _log_worker
+    with _log_worker_lock:
+        if _log_worker is None or not _log_worker.is_alive():
+            _log_worker = threading.Thread(
+                target=_process_log_queue, name="promptify-logger", daemon=True
+            )
+            _log_worker.start()
+
+
+def _flush_log_queue():
+    if _log_worker is not None and _log_worker.is_alive():
+        _LOG_QUEUE.join()
+
+
+def _reset_log_worker():
+    # A forked child inherits the queue and worker state but not the thread itself;
+    # messages queued in the parent are written by the parent.
+    global _LOG_QUEUE, _log_worker, _log_worker_lock
+    _LOG_QUEUE = queue.Queue(maxsize=10_000)
+    _log_worker = None
+    _log_worker_lock = threading.Lock()
+
+
+atexit.register(_flush_log_queue)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_log_worker)
+
+
+def _process_log_queue():
+    while True:
+        batch = [_LOG_QUEUE.get()]
+        while len(batch) < _LOG_BATCH_SIZE:
+            try:
+                batch.append(_LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+
+        pending = {}
+        for logger, message in batch:
+            pending.setdefault(logger, []).append(message)
+
+        for logger, messages in pending.items():
+            try:
+                logger._write_messages(messages)
+            except Exception as e:
+                print(f"Error in writing conversation log: {e}")
+
+        for _ in batch:
+            _LOG_QUEUE.task_done()
+
 
 class ConversationLogger:
     def __init__(self, conversation_path: str, llm_parameters: Dict):
@@ -20,25 +84,46 @@ class ConversationLogger:
         self.model_dict = {
             key: value
             for key, value in self.llm_parameters.items()
-            if is_string_or_digit(value)
+            if isinstance(value, STRING_OR_DIGIT_TYPES)
         }
 
     def add_message(self, message: Dict[str, Any]):
-        """Add a message to the conversation.
+        """Add a message to the conversation. The message is written in the background,
+        call `flush` to wait until it is on disk.
+        Args:
+            message: The message to add, as built by `create_message`.
+        """
+
+        self.add_messages([message])
+
+    def add_messages(self, messages: List[Dict[str, Any]]):
+        """Add several messages to the conversation. Messages are written in the background,
+        or synchronously if the write queue is full.
         Args:
-            prompt: The prompt sent to the language model.
-            response: The response generated by the language model.
-            source: The source of the message ("user" or "model").
-            metadata: Optional metadata about the message.
-            **kwargs: Additional metadata to be added to the message.
+            messages: The messages to add, as built by `create_message`.
         """
 
-        self.conversation = get_conversation_schema(
+        _start_log_worker()
+        for index, message in enumerate(messages):
+            try:
+                _LOG_QUEUE.put_nowait((self, message))
+            except queue.Full:
+                self._write_messages(messages[index:])
+                break
+
+    def flush(self):
+        """Block until all queued messages have been written."""
+
+        _flush_log_queue()
+
+    def _write_messages(self, messages: List[Dict[str, Any]]):
+        # built per call, the worker and a caller on a full queue may write concurrently
+        conversation = get_conversation_schema(
             self.conversation_id, self.llm_parameters["model"], **self.llm_parameters
         )
         message_id = str(uuid.uuid4())
-        self.conversation["messages"].append(message)
-        write_json(self.conversation_path, self.conversation, message_id)
+        conversation["messages"].extend(messages)
+        write_json(self.conversation_path, conversation, message_id)
 
     def __repr__(self):
         return f"ConversationLogger(conversation_id={self.conversation_id}, conversation_path={self.conversation_path})"
@@ -1,14 +1,72 @@
-import os
-import uuid
-from glob import glob
-import datetime
-from pathlib import Path
+import hashlib
 
-from promptify.utils.data_utils import *
-from promptify.prompter.template_loader import TemplateLoader
+from promptify.prompter.template_loader import TemplateLoader, DEFAULT_BYTECODE_CACHE_DIR
 
-from typing import List, Dict, Any, Optional
-from jinja2 import Environment, FileSystemLoader, meta, Template
+from typing import Callable, List, Dict, Any, Optional
+from jinja2 import nodes
+
+
+_PLAIN_TYPES = (str, int, float, type(None))
+
+
+def _is_plain(value) -> bool:
+    """Checks that a value is built only from types whose repr is exact."""
+
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            _is_plain(key) and _is_plain(item) for key, item in value.items()
+        )
+    return False
+
+
+def _compile_render(
+    parsed_template: nodes.Template,
+    pinned_kwargs: Dict[str, Any],
+    template_globals: Dict[str, Any],
+) -> Optional[Callable[..., str]]:
+    """Builds a render function for templates made only of text, constants and variables."""
+
+    segments = []
+    for body_node in parsed_template.body:
+        if not isinstance(body_node, nodes.Output):
+            return None
+        for node in body_node.nodes:
+            if isinstance(node, nodes.TemplateData):
+                segments.append((True, node.data))
+            elif isinstance(node, nodes.Const):
+                segments.append((True, str(node.value)))
+            elif isinstance(node, nodes.Name) and node.name in pinned_kwargs:
+                segments.append((True, str(pinned_kwargs[node.name])))
+            elif isinstance(node, nodes.Name):
+                segments.append((False, node.name))
+            else:
+                return None
+
+    parts = []
+    for is_constant, value in segments:
+        if is_constant and parts and isinstance(parts[-1], str):
+            parts[-1] += value
+        elif is_constant:
+            parts.append(value)
+        else:
+            parts.append((value,))
+
+    # names resolve like Jinja2: keyword arguments, then template globals (range, lipsum...),
+    # and undefined variables render as an empty string
+    expression = " + ".join(
+        repr(part)
+        if isinstance(part, str)
+        else f"str(kw.get({part[0]!r}, g.get({part[0]!r}, '')))"
+        for part in parts
+    )
+    source = f"def render(**kw):\n    return {expression or repr('')}\n"
+    namespace = {}
+    exec(source, {"__builtins__": {}, "str": str, "g": template_globals}, namespace)
+    return namespace["render"]
 
 
 class Prompter:
@@ -24,6 +82,7 @@ class Prompter:
         from_string = False,
         allowed_missing_variables: Optional[List[str]] = None,
         default_variable_values: Optional[Dict[str, Any]] = None,
+        bytecode_cache_dir: Optional[str] = DEFAULT_BYTECODE_CACHE_DIR,
     ) -> None:
         """
         Initialize Prompter with default or user-specified settings.
@@ -37,10 +96,12 @@ class Prompter:
         default_variable_values : dict of str: any, optional
             A dictionary mapping variable names to default values to be used in the template.
             If a variable is not found in the input dictionary or in the default values, it will be assumed to be required and an error will be raised. Default is an empty dictionary.
+        bytecode_cache_dir : str, optional
+            Directory where compiled templates are cached across processes. Default is ~/.cache/promptify/jinja, None disables it.
         """
 
         self.template = template
-        self.template_loader = TemplateLoader()
+        self.template_loader = TemplateLoader(bytecode_cache_dir)
         self.allowed_missing_variables = [
             "examples",
             "description",
@@ -54,7 +115,93 @@ class Prompter:
     def update_default_variable_values(self, new_defaults: Dict[str, Any]) -> None:
         self.default_variable_values.update(new_defaults)
 
-    def generate(self, text_input, model_name, **kwargs) -> str:
+    def cache_key(self, text_input, model_name, **kwargs) -> Optional[bytes]:
+        """
+        Computes a key identifying the prompt that `generate` would render, without rendering it.
+
+        Parameters
+        ----------
+        text_input : str
+            The input text to use in the prompt.
+        model_name : str
+            The name of the model the template is selected for.
+        **kwargs : dict
+            Additional variables to be used in the template.
+
+        Returns
+        -------
+        bytes or None
+            A 16-byte BLAKE2b digest of the template, model name, default values and variables, or None if
+            a variable is not a str, number, bool or None (or a list, tuple or dict of those). The key is built
+            from `repr` of the values, which can drop information for other objects (numpy arrays, DataFrames...).
+        """
+
+        if not (
+            _is_plain(text_input)
+            and _is_plain(kwargs)
+            and _is_plain(self.default_variable_values)
+        ):
+            return None
+
+        key_source = repr(
+            (
+                self.template,
+                self.from_string,
+                model_name,
+                text_input,
+                sorted(self.default_variable_values.items()),
+                sorted(kwargs.items()),
+            )
+        )
+        return hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).digest()
+
+    def compile_specialized(
+        self, model_name, pinned_kwargs: Optional[Dict[str, Any]] = None
+    ) -> Optional[Callable[..., str]]:
+        """
+        Compiles the template into a plain Python function that concatenates its text segments and
+        variables, bypassing the Jinja2 render machinery.
+
+        Parameters
+        ----------
+        model_name : str
+            The name of the model the template is selected for.
+        pinned_kwargs : dict of str: any, optional
+            Variables whose values are fixed and baked into the function as constants. Values must be hashable.
+            Compiled functions are cached on the loaded template, so reassigning `template` compiles afresh.
+
+        Returns
+        -------
+        callable or None
+            A function taking the template variables as keyword arguments and returning the rendered text, or None
+            if the template uses anything besides text, constants and plain variables (loops, filters, conditions...).
+        """
+
+        loader = self.template_loader.load_template(
+            self.template, model_name, self.from_string
+        )
+        if not pinned_kwargs:
+            return self._specialized_render(loader)
+
+        pinned_renders = loader.setdefault("pinned_renders", {})
+        cache_key = frozenset(pinned_kwargs.items())
+        if cache_key not in pinned_renders:
+            pinned_renders[cache_key] = _compile_render(
+                self.template_loader.parse_template(loader),
+                pinned_kwargs,
+                loader["template"].globals,
+            )
+        return pinned_renders[cache_key]
+
+    def _specialized_render(self, loader: Dict[str, Any]) -> Optional[Callable[..., str]]:
+        # compiled once per loaded template and stored on its entry
+        if "specialized_render" not in loader:
+            loader["specialized_render"] = _compile_render(
+                self.template_loader.parse_template(loader), {}, loader["template"].globals
+            )
+        return loader["specialized_render"]
+
+    def generate(self, text_input, model_name, *, verbose: bool = False, **kwargs) -> str:
         """
         Generates a prompt based on a template and input variables.
 
@@ -62,6 +209,8 @@ class Prompter:
         ----------
         text_input : str
             The input text to use in the prompt.
+        verbose : bool, optional
+            Print the generated prompt. Default is False.
         **kwargs : dict
             Additional variables to be used in the template.
 
@@ -75,36 +224,34 @@ class Prompter:
             self.template, model_name, self.from_string
         )
 
-        kwargs["text_input"] = text_input
+        template_vars = {**kwargs, "text_input": text_input}
 
-        if loader["environment"]:
-            variables = self.template_loader.get_template_variables(
-                loader["environment"], loader["template_name"]
+        if loader["environment"] and loader["has_vars"]:
+            variables = loader["variables"]
+            variables_missing = variables.difference(
+                template_vars,
+                self.allowed_missing_variables,
+                self.default_variable_values,
             )
-            variables_dict = {
-                temp_variable_: kwargs.get(temp_variable_, None)
-                for temp_variable_ in variables
-            }
-
-            variables_missing = [
-                variable
-                for variable in variables
-                if variable not in kwargs
-                and variable not in self.allowed_missing_variables
-                and variable not in self.default_variable_values
-            ]
 
             if variables_missing:
                 raise ValueError(
-                    f"Missing required variables in template {', '.join(variables_missing)}"
+                    f"Missing required variables in template {', '.join(sorted(variables_missing))}"
                 )
+
+            variables_dict = {
+                variable: template_vars.get(variable) for variable in variables
+            }
         else:
             variables_dict = {"data": None}
 
-        kwargs.update(self.default_variable_values)
-        prompt = loader["template"].render(**kwargs).strip()
+        render_vars = {**self.default_variable_values, **template_vars}
+        render = self._specialized_render(loader)
+        if render is None:
+            render = loader["template"].render
+        prompt = render(**render_vars).strip()
 
-        if kwargs.get("verbose", False):
+        if verbose:
             print(prompt)
 
         return prompt, variables_dict
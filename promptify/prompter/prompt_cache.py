@@ -1,24 +1,136 @@
-from functools import lru_cache, cached_property
+import hashlib
+import threading
+from collections import OrderedDict
+
 
 class PromptCache:
+    """
+    A least-recently-used cache for model outputs. String keys (prompts) are stored as their
+    16-byte BLAKE2b digest, so lookups compare fixed-size keys and long prompts are not kept in memory.
+    """
+
     def __init__(self, cache_size: int = 200):
         self.cache_size = cache_size
-        self._cache     = lru_cache(maxsize=cache_size)(self._raw_cache)()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
 
-    @cached_property
+    @property
     def cache(self):
         return self._cache
 
     def get(self, key):
-        return self.cache.get(key)
+        key = self._digest(key)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+        return value
 
     def add(self, key, value):
-        if key not in self.cache:
-            self.cache[key] = value
+        key = self._digest(key)
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
     def clear(self):
-        self.cache.clear()
+        with self._lock:
+            self._cache.clear()
 
     @staticmethod
-    def _raw_cache():
-        return {}
+    def _digest(key):
+        if isinstance(key, str):
+            return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return key
+
+
+class SemanticPromptCache:
+    """
+    A prompt cache that matches on meaning instead of exact text. Keys are embedded with a
+    sentence-transformers model and stored in FAISS HNSW indexes; a lookup returns the cached value
+    of the most similar stored key when its cosine similarity reaches `threshold`.
+
+    Entries can be grouped by `scope` (for example one scope per template), and a lookup only
+    compares keys within the same scope. When `cache_size` entries are stored, the oldest half is dropped.
+
+    Requires the optional `faiss-cpu` and `sentence-transformers` packages.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 200,
+        threshold: float = 0.87,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        hnsw_neighbors: int = 32,
+    ):
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SemanticPromptCache requires faiss and sentence-transformers, "
+                "install them with `pip install faiss-cpu sentence-transformers`"
+            ) from e
+
+        self._faiss = faiss
+        self.cache_size = cache_size
+        self.threshold = threshold
+        self.hnsw_neighbors = hnsw_neighbors
+        self.encoder = SentenceTransformer(model_name)
+        self.dimension = self.encoder.get_sentence_embedding_dimension()
+        self._entries = []
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, scope=None):
+        embedding = self._encode(key)
+        with self._lock:
+            scope_index = self._scopes.get(scope)
+            if scope_index is None:
+                return None
+
+            index, entries = scope_index
+            similarities, indices = index.search(embedding, 1)
+            position = indices[0][0]
+            if position < 0 or similarities[0][0] < self.threshold:
+                return None
+            return entries[position][2]
+
+    def add(self, key: str, value, scope=None):
+        embedding = self._encode(key)
+        with self._lock:
+            if len(self._entries) >= self.cache_size:
+                # HNSW indexes do not support removal, so drop the oldest half and rebuild.
+                self._entries = self._entries[len(self._entries) // 2 :]
+                self._build_indexes()
+            self._add_entry((scope, key, value, embedding))
+
+    def clear(self):
+        with self._lock:
+            self._entries = []
+            self._scopes = {}
+
+    def _encode(self, key: str):
+        return self.encoder.encode([key], normalize_embeddings=True).astype("float32")
+
+    def _add_entry(self, entry):
+        scope = entry[0]
+        if scope not in self._scopes:
+            index = self._faiss.IndexHNSWFlat(
+                self.dimension, self.hnsw_neighbors, self._faiss.METRIC_INNER_PRODUCT
+            )
+            self._scopes[scope] = (index, [])
+
+        index, entries = self._scopes[scope]
+        index.add(entry[3])
+        entries.append(entry)
+        self._entries.append(entry)
+
+    def _build_indexes(self):
+        entries = self._entries
+        self._entries = []
+        self._scopes = {}
+        for entry in entries:
+            self._add_entry(entry)
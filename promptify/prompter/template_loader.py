@@ -1,8 +1,31 @@
 import os
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from glob import glob
 from typing import List
 from promptify.utils.file_utils import *
-from jinja2 import Template, Environment, FileSystemLoader, meta
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    FileSystemBytecodeCache,
+    meta,
+    nodes,
+)
+
+DEFAULT_BYTECODE_CACHE_DIR = os.path.expanduser("~/.cache/promptify/jinja")
+FROM_STRING_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _bytecode_cache_for(bytecode_cache_dir: str):
+    # one directory check and one cache object per path, shared by every loader in the process
+    try:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(directory=bytecode_cache_dir, pattern="%s.cache")
 
 
 class TemplateLoader:
@@ -11,11 +34,23 @@ class TemplateLoader:
     listing available templates, and getting template variables.
     """
 
-    def __init__(self):
+    def __init__(self, bytecode_cache_dir: str = DEFAULT_BYTECODE_CACHE_DIR):
         """
-        Initialize the TemplateLoader object and create an empty dictionary for loaded templates.
+        Initialize the TemplateLoader object and create empty caches for loaded templates,
+        string templates (least recently used, keyed by source digest), Jinja2 environments
+        (one per template directory) and template variables.
+
+        Args:
+            bytecode_cache_dir (str): Directory where compiled template bytecode is persisted
+                across processes. Pass None to disable the bytecode cache.
         """
+        self.bytecode_cache_dir = bytecode_cache_dir
+        self.bytecode_cache = self._create_bytecode_cache(bytecode_cache_dir)
         self.loaded_templates = {}
+        self._from_string_cache = OrderedDict()
+        self._from_string_lock = threading.Lock()
+        self._environments = {}
+        self._template_variables = {}
 
     def load_template(
         self, template: str, model_name: str, from_string: bool = False
@@ -27,25 +62,94 @@ class TemplateLoader:
             template (str): Template string or path to the template file.
             from_string (bool): Whether to load the template from a string. Defaults to False.
 
+        Returns:
+            dict: Loaded template data, including the template source, the frozenset of
+            undeclared template variables and a `has_vars` flag.
+        """
+        if from_string:
+            return self._load_template_from_string(template)
+
+        cache_key = (template, model_name)
+        if cache_key not in self.loaded_templates:
+            self.loaded_templates[cache_key] = self._load_template_from_path(
+                template, model_name
+            )
+        return self.loaded_templates[cache_key]
+
+    def _load_template_from_string(self, template: str) -> dict:
+        """
+        Load a Jinja2 template from a string, reusing the compiled template for identical sources.
+
+        Args:
+            template (str): Template string.
+
         Returns:
             dict: Loaded template data.
         """
-        if template in self.loaded_templates:
-            return self.loaded_templates[template]
+        cache_key = hashlib.blake2b(template.encode("utf-8"), digest_size=16).digest()
+        with self._from_string_lock:
+            template_data = self._from_string_cache.get(cache_key)
+            if template_data is not None:
+                self._from_string_cache.move_to_end(cache_key)
+                return template_data
 
-        if from_string:
-            template_instance = Template(template)
-            template_data = {
-                "template_name": "from_string",
-                "template_dir": None,
-                "environment": None,
-                "template": template_instance,
-            }
-        else:
-            template_data = self._load_template_from_path(template, model_name)
+        environment = self._get_environment(None)
+        template_instance = environment.from_string(template)
+        variables = meta.find_undeclared_variables(environment.parse(template))
+        template_data = {
+            "template_name": "from_string",
+            "template_dir": None,
+            "environment": None,
+            "template": template_instance,
+            "source": template,
+            "variables": frozenset(variables),
+            "has_vars": bool(variables),
+        }
 
-        self.loaded_templates[template] = template_data
-        return self.loaded_templates[template]
+        with self._from_string_lock:
+            self._from_string_cache[cache_key] = template_data
+            if len(self._from_string_cache) > FROM_STRING_CACHE_SIZE:
+                self._from_string_cache.popitem(last=False)
+        return template_data
+
+    def _get_environment(self, template_dir: str) -> Environment:
+        """
+        Get the Jinja2 environment for a template directory, creating it on first use.
+
+        Args:
+            template_dir (str): Directory holding the templates, or None for string templates.
+
+        Returns:
+            Environment: The cached Jinja2 environment.
+        """
+        environment = self._environments.get(template_dir)
+        if environment is None:
+            if template_dir is None:
+                environment = Environment()
+            else:
+                environment = Environment(
+                    loader=FileSystemLoader(template_dir),
+                    bytecode_cache=self.bytecode_cache,
+                    auto_reload=False,
+                )
+            self._environments[template_dir] = environment
+        return environment
+
+    @staticmethod
+    def _create_bytecode_cache(bytecode_cache_dir: str):
+        """
+        Create a Jinja2 bytecode cache in the given directory.
+
+        Args:
+            bytecode_cache_dir (str): Directory for the cache files, or None.
+
+        Returns:
+            FileSystemBytecodeCache: The bytecode cache, or None if disabled or the directory
+            cannot be created.
+        """
+        if bytecode_cache_dir is None:
+            return None
+        return _bytecode_cache_for(bytecode_cache_dir)
 
     def _load_template_from_path(self, template: str, model_name: str) -> dict:
         """
@@ -69,7 +173,7 @@ class TemplateLoader:
 
             template_name = meta_data["metadata"]["file_name"]
             template_dir = meta_data["metadata"]["file_path"]
-            environment = Environment(loader=FileSystemLoader(template_dir))
+            environment = self._get_environment(template_dir)
             template_instance = environment.get_template(template_name)
 
         else:
@@ -78,14 +182,18 @@ class TemplateLoader:
 
             template_name = custom_template_name
             template_dir = custom_template_dir
-            environment = Environment(loader=FileSystemLoader(template_dir))
+            environment = self._get_environment(template_dir)
             template_instance = environment.get_template(custom_template_name)
 
+        variables = frozenset(self.get_template_variables(environment, template_name))
         return {
             "template_name": template_name,
             "template_dir": template_dir,
             "environment": environment,
             "template": template_instance,
+            "source": environment.loader.get_source(environment, template_name)[0],
+            "variables": variables,
+            "has_vars": bool(variables),
         }
 
 
@@ -139,9 +247,23 @@ class TemplateLoader:
         """
         return environment.list_templates()
 
+    def parse_template(self, template_data: dict) -> nodes.Template:
+        """
+        Parse a loaded template into its Jinja2 abstract syntax tree.
+
+        Args:
+            template_data (dict): Template data returned by `load_template`.
+
+        Returns:
+            nodes.Template: The parsed template.
+        """
+        environment = template_data["environment"] or self._get_environment(None)
+        return environment.parse(template_data["source"])
+
     def get_template_variables(self, environment, template_name) -> List[str]:
         """
         Get a list of undeclared variables for the specified template.
+        The result is computed once per template and cached.
 
         Args:
             environment (Environment): The Jinja2 environment of the template.
@@ -150,6 +272,13 @@ class TemplateLoader:
         Returns:
             List[str]: List of undeclared variables in the template.
         """
-        template_source = environment.loader.get_source(environment, template_name)
-        parsed_content = environment.parse(template_source)
-        return list(meta.find_undeclared_variables(parsed_content))
+        cache_key = (environment, template_name)
+        variables = self._template_variables.get(cache_key)
+        if variables is None:
+            template_source, _, _ = environment.loader.get_source(
+                environment, template_name
+            )
+            parsed_content = environment.parse(template_source)
+            variables = tuple(meta.find_undeclared_variables(parsed_content))
+            self._template_variables[cache_key] = variables
+        return list(variables)
@@ -1,5 +1,9 @@
 import json
 
+# bool is included through int
+STRING_OR_DIGIT_TYPES = (str, int, float)
+
+
 def is_string_or_digit(obj):
     """
     Check if an object is a string or a digit (integer or float).
@@ -18,6 +22,6 @@ def is_string_or_digit(obj):
         >>> is_string_or_digit(3.14)
         True
         >>> is_string_or_digit(True)
-        False
+        True
     """
-    return isinstance(obj, (str, int, float))
+    return isinstance(obj, STRING_OR_DIGIT_TYPES)
@@ -40,5 +40,8 @@ setup(
     package_data={"promptify.prompts.text2text": ["*/*.jinja", "*/metadata.json"]},
     install_requires=read_requirements("requirements.txt"),
     python_requires=">=3.7.0",
-    extras_require={"dev": read_requirements("requirements-dev.txt")},
+    extras_require={
+        "dev": read_requirements("requirements-dev.txt"),
+        "semantic": ["faiss-cpu", "sentence-transformers"],
+    },
 )
@@ -0,0 +1,51 @@
+import sys
+import types
+import pytest
+
+np = None
+
+
+class FakeIndex:
+    def __init__(self, dimension, neighbors, metric):
+        self.vectors = np.zeros((0, dimension), dtype="float32")
+
+    def add(self, vectors):
+        self.vectors = np.vstack([self.vectors, vectors])
+
+    def search(self, vectors, k):
+        similarities = self.vectors @ vectors[0]
+        best = int(np.argmax(similarities))
+        return np.array([[similarities[best]]]), np.array([[best]])
+
+
+class FakeEncoder:
+    vectors = {
+        "cat": [1.0, 0.0],
+        "kitten": [0.9, 0.4359],
+        "car": [0.0, 1.0],
+    }
+
+    def __init__(self, model_name):
+        pass
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, normalize_embeddings=True):
+        return np.array([self.vectors[text] for text in texts])
+
+
+@pytest.fixture
+def semantic_stubs(monkeypatch):
+    global np
+    np = pytest.importorskip("numpy")
+    monkeypatch.setitem(
+        sys.modules,
+        "faiss",
+        types.SimpleNamespace(IndexHNSWFlat=FakeIndex, METRIC_INNER_PRODUCT=0),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "sentence_transformers",
+        types.SimpleNamespace(SentenceTransformer=FakeEncoder),
+    )
@@ -1,3 +1,4 @@
+import itertools
 import pytest
 from promptify import Parser
 
@@ -20,6 +21,21 @@ def test_get_combinations(parser):
     assert combinations == ["}", "}}", "]}"]
 
 
+@pytest.mark.parametrize("candidate_marks", [["}", "]"], ["]", "}"], ["}"], ["]"]])
+@pytest.mark.parametrize("should_end_mark", [None, "}", "]"])
+@pytest.mark.parametrize("n", [0, 1, 2, 5])
+def test_get_combinations_matches_full_product(
+    parser, candidate_marks, should_end_mark, n
+):
+    expected = [
+        "".join(comb)
+        for i in range(1, n)
+        for comb in itertools.product(candidate_marks, repeat=i)
+        if should_end_mark is None or comb[-1] == should_end_mark
+    ]
+    assert parser.get_combinations(candidate_marks, n, should_end_mark) == expected
+
+
 def test_escaped_(parser):
     case_1 = """[[{'T': 'ANATOMY', 'E': 'immune system'},{'T': 'DISEASE', 'E': 'Parkinson's disease'},{'T': 'other', 'E': 'person's health'}]]"""
     case_2 = """[[{"T": "ANATOMY", "E": "immune system"},{"T": "DISEASE", "E": "Parkinson"s disease"},{"T": "other", "E": "person"s health"}]]"""
@@ -0,0 +1,172 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from typing import Dict, List
+from promptify import Model, Pipeline, Prompter
+
+
+class EchoModel(Model):
+    name = "echo_model"
+    description = "Echoes the prompt back"
+
+    def __init__(self):
+        super().__init__("api_key", "echo_model", api_wait=1, api_retry=1)
+        self.calls = []
+
+    def supported_models(self) -> List[str]:
+        return ["echo_model"]
+
+    def _verify_model(self):
+        pass
+
+    def set_key(self, api_key: str):
+        self.api_key = api_key
+
+    def set_model(self, model: str):
+        self.model = model
+
+    def get_description(self) -> str:
+        return self.description
+
+    def get_endpoint(self) -> str:
+        return "https://echo.endpoint/"
+
+    def get_parameters(self) -> Dict[str, str]:
+        return {}
+
+    def run(self, prompt: str):
+        self.calls.append(prompt)
+        return prompt
+
+    def model_output(self, response, json_depth_limit=None):
+        return {"text": response, "parsed": {"data": {"completion": [response]}}}
+
+
+class FailingEchoModel(EchoModel):
+    def run(self, prompt: str):
+        if prompt == "Say b":
+            raise RuntimeError("model failure")
+        return super().run(prompt)
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    prompter = Prompter(
+        "Say {{ text_input }}", from_string=True, bytecode_cache_dir=None
+    )
+    return Pipeline(prompter, EchoModel(), output_path=str(tmp_path))
+
+
+def test_fit(pipeline):
+    output = pipeline.fit("hello")
+    assert output[0]["text"] == "Say hello"
+
+
+def test_fit_many_preserves_order(pipeline):
+    outputs = pipeline.fit_many(["a", "b", "c"])
+    assert [output[0]["text"] for output in outputs] == ["Say a", "Say b", "Say c"]
+
+
+def test_fit_many_runs_each_prompt_once(pipeline):
+    pipeline.fit("a")
+    pipeline.fit_many(["a", "b", "b"])
+    assert pipeline.model.calls == ["Say a", "Say b"]
+
+
+def test_afit_many(pipeline):
+    outputs = asyncio.run(pipeline.afit_many(["a", "b", "a"], concurrency=2))
+    assert [output[0]["text"] for output in outputs] == ["Say a", "Say b", "Say a"]
+    assert sorted(pipeline.model.calls) == ["Say a", "Say b"]
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_afit_many_rejects_non_positive_concurrency(pipeline, concurrency):
+    with pytest.raises(ValueError):
+        asyncio.run(pipeline.afit_many(["a"], concurrency=concurrency))
+
+
+def test_unknown_cache_kind(tmp_path):
+    prompter = Prompter(
+        "Say {{ text_input }}", from_string=True, bytecode_cache_dir=None
+    )
+    with pytest.raises(ValueError):
+        Pipeline(prompter, EchoModel(), output_path=str(tmp_path), cache_kind="fuzzy")
+
+
+def test_fit_skips_rendering_on_cache_hit(pipeline, monkeypatch):
+    pipeline.fit("a")
+    prompter = pipeline.prompters[0]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("prompt rendered twice")
+
+    monkeypatch.setattr(prompter, "generate", fail)
+    assert pipeline.fit("a")[0]["text"] == "Say a"
+
+
+def test_logs_written_to_output_path(pipeline, tmp_path):
+    pipeline.fit("a")
+    pipeline.logger.flush()
+    assert list(tmp_path.glob("llm_responses/*/*.json"))
+
+
+def test_fit_from_threads(pipeline):
+    inputs = [str(i % 5) for i in range(40)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(pipeline.fit, inputs))
+    assert [output[0]["text"] for output in outputs] == [f"Say {i}" for i in inputs]
+
+
+def test_verbose_is_not_a_template_variable(pipeline, capsys):
+    output = pipeline.fit("a", verbose=True)
+    assert output[0]["text"] == "Say a"
+    assert capsys.readouterr().out.count("Say a") == 1
+
+
+def test_fit_many_isolates_failing_input(tmp_path):
+    prompter = Prompter(
+        "Say {{ text_input }}", from_string=True, bytecode_cache_dir=None
+    )
+    pipeline = Pipeline(prompter, FailingEchoModel(), output_path=str(tmp_path))
+    outputs = pipeline.fit_many(["a", "b", "c"])
+    assert outputs[0][0]["text"] == "Say a"
+    assert outputs[1] is None
+    assert outputs[2][0]["text"] == "Say c"
+
+    pipeline.fit_many(["a", "c"])
+    assert pipeline.model.calls == ["Say a", "Say c"]
+
+
+def test_semantic_cache_compares_text_input_per_template(tmp_path, semantic_stubs):
+    prompter = Prompter(
+        "Say {{ text_input }}{{ suffix }}", from_string=True, bytecode_cache_dir=None
+    )
+    pipeline = Pipeline(
+        prompter, EchoModel(), output_path=str(tmp_path), cache_kind="semantic"
+    )
+    pipeline.fit("cat", suffix="!")
+    assert pipeline.fit("kitten", suffix="!")[0]["text"] == "Say cat!"
+    assert pipeline.fit("car", suffix="!")[0]["text"] == "Say car!"
+    assert pipeline.fit("kitten", suffix="?")[0]["text"] == "Say kitten?"
+    assert pipeline.model.calls == ["Say cat!", "Say car!", "Say kitten?"]
+
+
+class TruncatedRepr:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "TruncatedRepr(...)"
+
+    def __str__(self):
+        return self.value
+
+
+def test_render_cache_skipped_for_values_with_lossy_repr(tmp_path):
+    prompter = Prompter(
+        "Say {{ text_input }} {{ extra }}", from_string=True, bytecode_cache_dir=None
+    )
+    pipeline = Pipeline(prompter, EchoModel(), output_path=str(tmp_path))
+    assert prompter.cache_key("a", None, extra=TruncatedRepr("x")) is None
+    assert pipeline.fit("a", extra=TruncatedRepr("x"))[0]["text"] == "Say a x"
+    assert pipeline.fit("a", extra=TruncatedRepr("y"))[0]["text"] == "Say a y"
@@ -0,0 +1,37 @@
+import json
+import os
+import signal
+import pytest
+from promptify import ConversationLogger
+
+
+def test_add_message_is_written_after_flush(tmp_path):
+    logger = ConversationLogger(str(tmp_path), {"model": "mock_model"})
+    logger.add_message({"input_prompt": "a"})
+    logger.add_messages([{"input_prompt": "b"}, {"input_prompt": "c"}])
+    logger.flush()
+
+    prompts = []
+    for path in sorted(tmp_path.glob("llm_responses/*/*.json")):
+        with open(path) as f:
+            prompts.extend(m["input_prompt"] for m in json.load(f)["messages"])
+    assert sorted(prompts) == ["a", "b", "c"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_add_message_after_fork(tmp_path):
+    logger = ConversationLogger(str(tmp_path / "parent"), {"model": "mock_model"})
+    logger.add_message({"input_prompt": "parent"})
+    logger.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        signal.alarm(10)
+        child_path = tmp_path / "child"
+        child_logger = ConversationLogger(str(child_path), {"model": "mock_model"})
+        child_logger.add_message({"input_prompt": "child"})
+        child_logger.flush()
+        os._exit(0 if list(child_path.glob("llm_responses/*/*.json")) else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
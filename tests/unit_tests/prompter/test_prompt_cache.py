@@ -0,0 +1,67 @@
+import pytest
+from promptify import PromptCache, SemanticPromptCache
+
+
+def test_add_and_get():
+    cache = PromptCache()
+    cache.add("a long prompt", {"text": "output"})
+    assert cache.get("a long prompt") == {"text": "output"}
+    assert cache.get("another prompt") is None
+
+
+def test_add_does_not_overwrite():
+    cache = PromptCache()
+    cache.add("prompt", 1)
+    cache.add("prompt", 2)
+    assert cache.get("prompt") == 1
+
+
+def test_keys_are_digests():
+    cache = PromptCache()
+    cache.add("x" * 10_000, 1)
+    assert all(len(key) == 16 for key in cache.cache)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PromptCache(cache_size=2)
+    cache.add("a", 1)
+    cache.add("b", 2)
+    cache.get("a")
+    cache.add("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.fixture
+def semantic_cache(semantic_stubs):
+    return SemanticPromptCache(cache_size=4, threshold=0.87)
+
+
+def test_semantic_hit_and_miss(semantic_cache):
+    assert semantic_cache.get("cat") is None
+    semantic_cache.add("cat", "meow")
+    assert semantic_cache.get("cat") == "meow"
+    assert semantic_cache.get("kitten") == "meow"
+    assert semantic_cache.get("car") is None
+
+
+def test_semantic_threshold(semantic_cache):
+    semantic_cache.threshold = 0.95
+    semantic_cache.add("cat", "meow")
+    assert semantic_cache.get("kitten") is None
+
+
+def test_semantic_scopes_are_separate(semantic_cache):
+    semantic_cache.add("cat", "meow", scope="ner")
+    assert semantic_cache.get("cat", scope="ner") == "meow"
+    assert semantic_cache.get("cat", scope="qa") is None
+
+
+def test_semantic_eviction(semantic_cache):
+    for scope in ["a", "b", "c", "d", "e"]:
+        semantic_cache.add("cat", scope, scope=scope)
+    assert semantic_cache.get("cat", scope="a") is None
+    assert semantic_cache.get("cat", scope="b") is None
+    assert semantic_cache.get("cat", scope="c") == "c"
+    assert semantic_cache.get("cat", scope="e") == "e"
@@ -99,3 +99,63 @@ class TestPrompter:
         with pytest.raises(ValueError):
             prompter = Prompter(model=model)
             prompter.load_template("non_existent_template.jinja")
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            "Say {{ text_input }} in {{ domain }}.\n",
+            "{{ text_input }}{{ missing }}{{ 'constant' }}",
+            "{{ range }} {{ lipsum }} {{ text_input }}",
+            "",
+        ],
+    )
+    def test_compile_specialized_matches_jinja(self, template):
+        prompter = Prompter(template, from_string=True, bytecode_cache_dir=None)
+        render = prompter.compile_specialized(None)
+        loader = prompter.template_loader.load_template(template, None, from_string=True)
+        assert render is not None
+        assert render(text_input="hi", domain=None) == loader["template"].render(
+            text_input="hi", domain=None
+        )
+
+    def test_compile_specialized_pinned_kwargs(self):
+        prompter = Prompter(
+            "{{ text_input }} in {{ domain }}", from_string=True, bytecode_cache_dir=None
+        )
+        render = prompter.compile_specialized(None, {"domain": "medicine"})
+        assert render(text_input="hi", domain="ignored") == "hi in medicine"
+
+    def test_compile_specialized_falls_back_for_control_flow(self):
+        prompter = Prompter("ner.jinja", bytecode_cache_dir=None)
+        assert prompter.compile_specialized("gpt-3.5-turbo") is None
+
+    def test_reassigned_template_is_rendered(self):
+        prompter = Prompter(
+            "Hello {{ text_input }}", from_string=True, bytecode_cache_dir=None
+        )
+        assert prompter.generate("a", None)[0] == "Hello a"
+        prompter.template = "Bye {{ text_input }}"
+        assert prompter.generate("a", None)[0] == "Bye a"
+        assert prompter.compile_specialized(None)(text_input="a") == "Bye a"
+
+    def test_generate_does_not_override_explicit_variables(self):
+        prompter = Prompter(
+            "{{ text_input }} {{ domain }}",
+            from_string=True,
+            default_variable_values={"domain": "general"},
+            bytecode_cache_dir=None,
+        )
+        assert prompter.generate("a", None)[0] == "a general"
+        assert prompter.generate("a", None, domain="medical")[0] == "a medical"
+
+    def test_generate_reads_mutated_defaults_and_allowed_missing(self, tmp_path):
+        template_path = tmp_path / "domain.jinja"
+        template_path.write_text("{{ text_input }} {{ domain }}")
+
+        prompter = Prompter(str(template_path), bytecode_cache_dir=None)
+        prompter.default_variable_values["domain"] = "med"
+        assert prompter.generate("a", None)[0] == "a med"
+
+        prompter = Prompter(str(template_path), bytecode_cache_dir=None)
+        prompter.allowed_missing_variables.append("domain")
+        assert prompter.generate("a", None)[0] == "a"
@@ -0,0 +1,77 @@
+import pytest
+from promptify import TemplateLoader
+
+
+@pytest.fixture
+def template_loader(tmp_path):
+    return TemplateLoader(bytecode_cache_dir=str(tmp_path / "bytecode"))
+
+
+def test_load_template_is_cached(template_loader):
+    first = template_loader.load_template("ner.jinja", "gpt-3.5-turbo")
+    second = template_loader.load_template("ner.jinja", "gpt-3.5-turbo")
+    assert first is second
+
+
+def test_environment_shared_per_directory(template_loader, tmp_path):
+    (tmp_path / "a.jinja").write_text("{{ text_input }}")
+    (tmp_path / "b.jinja").write_text("{{ text_input }} {{ labels }}")
+    first = template_loader.load_template(str(tmp_path / "a.jinja"), "gpt-3.5-turbo")
+    second = template_loader.load_template(str(tmp_path / "b.jinja"), "gpt-3.5-turbo")
+    assert first["environment"] is second["environment"]
+
+
+def test_from_string_template_is_cached(template_loader):
+    first = template_loader.load_template("Hello {{ name }}", None, from_string=True)
+    second = template_loader.load_template("Hello {{ name }}", None, from_string=True)
+    assert first["template"] is second["template"]
+    assert first["template"].render(name="world") == "Hello world"
+
+
+def test_template_variables(template_loader):
+    loader = template_loader.load_template("ner.jinja", "gpt-3.5-turbo")
+    variables = template_loader.get_template_variables(
+        loader["environment"], loader["template_name"]
+    )
+    assert "text_input" in variables
+    assert variables == template_loader.get_template_variables(
+        loader["environment"], loader["template_name"]
+    )
+
+
+def test_bytecode_cache_written(tmp_path):
+    cache_dir = tmp_path / "bytecode"
+    template_loader = TemplateLoader(bytecode_cache_dir=str(cache_dir))
+    template_loader.load_template("ner.jinja", "gpt-3.5-turbo")
+    assert any(path.suffix == ".cache" for path in cache_dir.iterdir())
+
+
+def test_bytecode_cache_shared_per_directory(tmp_path):
+    cache_dir = str(tmp_path / "bytecode")
+    first = TemplateLoader(bytecode_cache_dir=cache_dir)
+    second = TemplateLoader(bytecode_cache_dir=cache_dir)
+    assert first.bytecode_cache is second.bytecode_cache
+
+
+def test_bytecode_cache_disabled():
+    template_loader = TemplateLoader(bytecode_cache_dir=None)
+    loader = template_loader.load_template("ner.jinja", "gpt-3.5-turbo")
+    assert loader["environment"].bytecode_cache is None
+
+
+def test_load_template_precomputes_variables(template_loader):
+    loader = template_loader.load_template("Hi {{ name }} {{ text_input }}", None, from_string=True)
+    assert loader["variables"] == frozenset({"name", "text_input"})
+
+
+def test_from_string_cache_is_bounded(template_loader):
+    first = template_loader.load_template("Template 0 {{ text_input }}", None, from_string=True)
+    for i in range(1, 300):
+        template_loader.load_template(f"Template {i} {{{{ text_input }}}}", None, from_string=True)
+    reloaded = template_loader.load_template("Template 0 {{ text_input }}", None, from_string=True)
+    assert reloaded["template"] is not first["template"]
+
+
+def test_has_vars(template_loader):
+    assert template_loader.load_template("{{ text_input }}", None, from_string=True)["has_vars"]
+    assert not template_loader.load_template("static", None, from_string=True)["has_vars"]